@@ -1,177 +1,427 @@
+import os
 import time
-import copy
 import math
 import threading
 import random
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    # Numba is optional: when installed, the bitboard kernels below are
+    # compiled to machine code; without it they run as plain Python.
+    from numba import njit, uint64
+except ImportError:
+    def njit(*args, **kwargs):
+        return lambda f: f
+
+    uint64 = int
 
 ## Solution for the first assignment in the course Artificial Intelligence (EDAP01) at LTH.
 ## Authors are Aron Somi and Moritz Windsberger. Parts of the code is written by generative AI (mainly the play_game() function).
 
+FULL = 0xFFFFFFFFFFFFFFFF
+NOT_A = 0xFEFEFEFEFEFEFEFE  # every square except column 0
+NOT_H = 0x7F7F7F7F7F7F7F7F  # every square except column 7
+
+# The eight board directions as (shift, wraparound mask) pairs:
+# E, W, S, N, SE, SW, NE, NW for the r*8+c square numbering.
+DIRECTIONS = (
+    (1, NOT_A), (-1, NOT_H), (8, FULL), (-8, FULL),
+    (9, NOT_A), (7, NOT_H), (-7, NOT_A), (-9, NOT_H),
+)
+
+# Zobrist keys: one random 64-bit number per (color, square), plus one for
+# the side to move, so the hash can be updated incrementally move by move.
+ZOBRIST = [[random.getrandbits(64) for _ in range(64)] for _ in range(2)]
+ZOBRIST_SIDE = random.getrandbits(64)
+
+COLOR = {"B": 0, "W": 1}
+
+# Transposition table: hash -> (depth, value, flag, best_move), capped
+# so a long think cannot grow without bound.
+EXACT, LOWER, UPPER = 0, 1, 2
+_TT = {}
+_TT_MAX = 1 << 20
+
+# Classic Othello positional weights indexed by r*8+c, used for move
+# ordering: corners are prized, the X- and C-squares beside them are
+# liabilities until the corner is settled.
+SQUARE_WEIGHTS = (
+    100, -20, 10, 5, 5, 10, -20, 100,
+    -20, -50, -2, -2, -2, -2, -50, -20,
+    10, -2, -1, -1, -1, -1, -2, 10,
+    5, -2, -1, -1, -1, -1, -2, 5,
+    5, -2, -1, -1, -1, -1, -2, 5,
+    10, -2, -1, -1, -1, -1, -2, 10,
+    -20, -50, -2, -2, -2, -2, -50, -20,
+    100, -20, 10, 5, 5, 10, -20, 100,
+)
+CORNER_MASK = 0x8100000000000081  # the four corner squares as a bitboard
+
+# Killer moves: the last two moves that caused a beta cutoff at each depth.
+_killers = {}
+
+OPP = {"B": "W", "W": "B"}
+
+# The clock is only read once per _TIME_CHECK_MASK+1 nodes; a search that
+# runs out of time unwinds by raising SearchTimeout.
+_TIME_CHECK_MASK = 4095
+_node_count = [0]
+
+# Half-width of the aspiration window around the previous iteration's
+# score (the evaluations only span a few dozen points).
+ASPIRATION = 10
+
+
+class SearchTimeout(Exception):
+    pass
+
+
+# The evaluation function for the search in progress. The choice is fixed
+# for a whole game, so it is bound once per search instead of being passed
+# through (and repacked at) every recursive negamax call.
+_eval_fun = None
+
 
 def initialize_board():
-    board = [["." for _ in range(8)] for _ in range(8)]
-    board[3][3] = "W"
-    board[4][4] = "W"
-    board[3][4] = "B"
-    board[4][3] = "B"
-    return board
+    # The board is a pair of 64-bit bitboards (black, white),
+    # where bit r*8+c represents square (r, c).
+    black = (1 << 28) | (1 << 35)
+    white = (1 << 27) | (1 << 36)
+    return (black, white)
+
+
+def _bit(row, col):
+    return 1 << (row * 8 + col)
+
+
+def _player_boards(board, player):
+    # Returns the (own, opponent) bitboards seen from the given player.
+    black, white = board
+    return (black, white) if player == "B" else (white, black)
+
+
+@njit("uint64(uint64, int64)", cache=True)
+def _shift(bb, d):
+    # Shifts a whole bitboard d steps; wraparound between columns 0 and 7
+    # is handled by the masked propagators at the call sites.
+    if d > 0:
+        return (bb << uint64(d)) & FULL
+    return bb >> uint64(-d)
+
+
+@njit("uint64(uint64, uint64, int64)", cache=True)
+def _kogge_stone_fill(seed, p, d):
+    # Kogge-Stone occluded fill: runs of up to 7 propagator disks are
+    # covered in 3 rounds by doubling the shift distance each round,
+    # instead of 6 sequential single-step shifts. The pre-masked
+    # propagator p also blocks column wraparound for the doubled shifts.
+    t = p & _shift(seed, d)
+    t |= p & _shift(t, d)
+    p &= _shift(p, d)
+    d2 = d + d
+    t |= p & _shift(t, d2)
+    p &= _shift(p, d2)
+    t |= p & _shift(t, d2 + d2)
+    return t
+
+
+@njit("uint64(uint64, uint64, uint64, int64, uint64)", cache=True)
+def _directional_moves(P, O, empty, d, mask):
+    # Flood runs of opponent disks adjacent to P in one direction; a
+    # final shift lands on the playable empty squares.
+    t = _kogge_stone_fill(P, O & mask, d)
+    return empty & mask & _shift(t, d)
+
+
+@njit("uint64(uint64, uint64, uint64, int64, uint64)", cache=True)
+def _directional_flip(P, O, bit, d, mask):
+    # Disks flipped in one direction by playing on bit, or 0 if the run
+    # of opponent disks is not capped by one of our own.
+    t = _kogge_stone_fill(bit, O & mask, d)
+    if _shift(t, d) & mask & P:
+        return t
+    return uint64(0)
+
+
+# Cache of generated move bitboards, keyed by the (own, opponent) disks.
+# Iterative deepening and the mobility evaluation ask for the same
+# positions over and over; the key order encodes the side to move.
+_MOVE_CACHE = {}
+_MOVE_CACHE_MAX = 1 << 20
+
+
+def get_moves_bb(P, O):
+    # Computes the bitboard of legal moves for the side with disks P
+    # against disks O, one flood per direction.
+    key = (P, O)
+    cached = _MOVE_CACHE.get(key)
+    if cached is not None:
+        return cached
+    empty = ~(P | O) & FULL
+    moves = 0
+    for d, mask in DIRECTIONS:
+        moves |= _directional_moves(P, O, empty, d, mask)
+    if len(_MOVE_CACHE) >= _MOVE_CACHE_MAX:
+        _MOVE_CACHE.clear()
+    _MOVE_CACHE[key] = moves
+    return moves
+
+
+def _compute_flip(P, O, bit):
+    # Returns the bitboard of opponent disks flipped by playing on bit.
+    flip = 0
+    for d, mask in DIRECTIONS:
+        flip |= _directional_flip(P, O, bit, d, mask)
+    return flip
+
+
+def _hash_pos(P, O, color):
+    # Full Zobrist hash of a position; only needed at the root, the
+    # search keeps the hash up to date incrementally from there.
+    h = ZOBRIST_SIDE if color else 0
+    for keys, bb in ((ZOBRIST[color], P), (ZOBRIST[1 - color], O)):
+        while bb:
+            lsb = bb & -bb
+            h ^= keys[lsb.bit_length() - 1]
+            bb ^= lsb
+    return h
+
+
+def _update_hash(h, color, bit, flip):
+    # Incremental Zobrist update for a move by color: place the new disk,
+    # recolor the flipped disks and toggle the side to move. Walks only
+    # the set bits of the flip mask instead of rehashing 64 squares.
+    own, opp = ZOBRIST[color], ZOBRIST[1 - color]
+    h ^= ZOBRIST_SIDE ^ own[bit.bit_length() - 1]
+    while flip:
+        lsb = flip & -flip
+        sq = lsb.bit_length() - 1
+        h ^= own[sq] ^ opp[sq]
+        flip ^= lsb
+    return h
 
 
 def print_board(board):
 
+    black, white = board
+    # Flat 64-cell display buffer indexed by r*8+c; only the occupied
+    # squares are visited instead of testing every cell per row.
+    cells = ["."] * 64
+    for ch, bb in (("B", black), ("W", white)):
+        while bb:
+            lsb = bb & -bb
+            cells[lsb.bit_length() - 1] = ch
+            bb ^= lsb
     print("  " + " ".join(map(str, range(8))))
-    for i, row in enumerate(board):
-        print(f"{i} " + " ".join(row))
+    for r in range(8):
+        print(f"{r} " + " ".join(cells[r * 8 : r * 8 + 8]))
 
 
 def is_valid_move(board, row, col, player):
-    # Looks at the adjecent squares in each direction, an first finds an
-    # opponent disk, then checks if there is a player disk in the same direction
-    if board[row][col] != ".":
-        return False
-    opponent = "B" if player == "W" else "W"
-
-    directions = [(-1, 0), (1, 0), (0, -1), (0, 1), (-1, -1), (-1, 1), (1, -1), (1, 1)]
-
-    for dr, dc in directions:
-        r, c = row + dr, col + dc
-        found_opponent = False
-        while 0 <= r < 8 and 0 <= c < 8:
-            if board[r][c] == opponent:
-                found_opponent = True
-            elif board[r][c] == player:
-                if found_opponent:
-                    return True
-                break
-            else:
-                break
-            r += dr
-            c += dc
-    return False
+    # A move is valid iff its square is set in the legal-move bitboard.
+    P, O = _player_boards(board, player)
+    return get_moves_bb(P, O) & _bit(row, col) != 0
 
 
 def get_valid_moves(board, player):
-    # Returns all the possible moves the player can make
-    return [
-        (r, c) for r in range(8) for c in range(8) if is_valid_move(board, r, c, player)
-    ]
+    # Returns all the possible moves the player can make. Only the set
+    # bits of the move bitboard are visited (lowest bit first, which is
+    # row-major order), instead of scanning all 64 squares.
+    P, O = _player_boards(board, player)
+    bb = get_moves_bb(P, O)
+    moves = []
+    while bb:
+        lsb = bb & -bb
+        moves.append(divmod(lsb.bit_length() - 1, 8))
+        bb ^= lsb
+    return moves
+
+
+def get_moves_with_flips(P, O):
+    # One pass that returns each legal move together with its placed bit
+    # and flip mask, so the search does not walk the directions a second
+    # time to apply the move it just generated.
+    moves = []
+    bb = get_moves_bb(P, O)
+    while bb:
+        lsb = bb & -bb
+        moves.append((divmod(lsb.bit_length() - 1, 8), lsb, _compute_flip(P, O, lsb)))
+        bb ^= lsb
+    return moves
+
+
+def _apply_bb(P, O, bit):
+    # Makes a move directly on the bitboards and returns the child
+    # (own, opponent) pair. Ints are immutable, so the parent position
+    # is untouched and "unmake" is simply keeping the old P and O.
+    flip = _compute_flip(P, O, bit)
+    return P | flip | bit, O & ~flip
 
 
 def apply_move(board, row, col, player):
-    # Actually changes the game state.
-    opponent = "B" if player == "W" else "W"
-    directions = [(-1, 0), (1, 0), (0, -1), (0, 1), (-1, -1), (-1, 1), (1, -1), (1, 1)]
+    # Returns the board after the move; the bitboards are plain ints,
+    # so the caller keeps its own board unchanged.
+    P, O = _player_boards(board, player)
+    P, O = _apply_bb(P, O, _bit(row, col))
+    return (P, O) if player == "B" else (O, P)
 
-    board[row][col] = player
-    for dr, dc in directions:
-        r, c = row + dr, col + dc
-        disks_to_flip = []
-        while 0 <= r < 8 and 0 <= c < 8 and board[r][c] == opponent:
-            disks_to_flip.append((r, c))
-            r += dr
-            c += dc
-        if 0 <= r < 8 and 0 <= c < 8 and board[r][c] == player:
 
-            for fr, fc in disks_to_flip:
-                board[fr][fc] = player
+_EVAL_CACHE = {}
+_EVAL_CACHE_MAX = 1 << 20
 
 
-def evaluate_advanced(board, player):
+def evaluate_advanced(P, O, own_moves=None):
     # The better evaulation function used for the more advance AI,
-    # it takes into account the number of pieces, the corners and the mobility of the player.
-    opponent = "B" if player == "W" else "W"
+    # it takes into account the number of pieces, the corners and the
+    # mobility, all from the side to move's perspective.
+    key = (P, O)
+    cached = _EVAL_CACHE.get(key)
+    if cached is not None:
+        return cached
 
-    # Piece Count
-    player_pieces = sum(row.count(player) for row in board)
-    opponent_pieces = sum(row.count(opponent) for row in board)
-    piece_score = player_pieces - opponent_pieces
+    # Piece Count (int.bit_count is a C-level popcount)
+    piece_score = P.bit_count() - O.bit_count()
 
     # Corner Control
-    corners = [(0, 0), (0, 7), (7, 0), (7, 7)]
-    player_corners = sum(1 for r, c in corners if board[r][c] == player)
-    opponent_corners = sum(1 for r, c in corners if board[r][c] == opponent)
-    corner_score = (player_corners - opponent_corners) * 5
-
-    # Mobility
-    player_moves = len(get_valid_moves(board, player))
-    opponent_moves = len(get_valid_moves(board, opponent))
+    corner_score = ((P & CORNER_MASK).bit_count() - (O & CORNER_MASK).bit_count()) * 5
+
+    # Mobility. The search already knows the side to move's move
+    # bitboard at every node it evaluates, so it passes it in rather
+    # than have it recomputed here.
+    if own_moves is None:
+        own_moves = get_moves_bb(P, O)
+    player_moves = own_moves.bit_count()
+    opponent_moves = get_moves_bb(O, P).bit_count()
     mobility_score = (player_moves - opponent_moves) * 2
 
-    return piece_score + corner_score + mobility_score
+    score = piece_score + corner_score + mobility_score
+    if len(_EVAL_CACHE) >= _EVAL_CACHE_MAX:
+        _EVAL_CACHE.clear()
+    _EVAL_CACHE[key] = score
+    return score
 
 
-def evaluate_piece_count(board, player):
-    opponent = "B" if player == "W" else "W"
-    player_score = sum(row.count(player) for row in board)
-    opponent_score = sum(row.count(opponent) for row in board)
-    return player_score - opponent_score
+def evaluate_piece_count(P, O, own_moves=None):
+    # own_moves is accepted (and unused) so both evaluation functions
+    # share the signature the search calls them with.
+    return P.bit_count() - O.bit_count()
 
 
-def minimax(
-    board,
-    depth,
-    alpha,
-    beta,
-    maximizing_player,
-    player,
-    start_time,
-    time_limit,
-    eval_fun,
-):
-    # The minimax algorithm.
-    opponent = "B" if player == "W" else "W"
-    valid_moves = get_valid_moves(board, player if maximizing_player else opponent)
+def _record_killer(depth, move):
+    # Remembers a beta-cutoff move so siblings at the same depth try it early.
+    killers = _killers.setdefault(depth, [None, None])
+    if move != killers[0]:
+        killers[1] = killers[0]
+        killers[0] = move
 
-    if depth == 0 or not valid_moves or time.time() - start_time > time_limit:
-        return eval_fun(board, player), None
 
-    best_move = None
-    if maximizing_player:
-        max_eval = -math.inf
-        for move in valid_moves:
-            new_board = copy.deepcopy(board)
-            apply_move(new_board, move[0], move[1], player)
-            eval_score, _ = minimax(
-                new_board,
-                depth - 1,
-                alpha,
-                beta,
-                False,
-                player,
-                start_time,
-                time_limit,
-                eval_fun,
-            )
-            if eval_score > max_eval:
-                max_eval = eval_score
-                best_move = move
-            alpha = max(alpha, eval_score)
-            if beta <= alpha or time.time() - start_time > time_limit:
-                break
-        return max_eval, best_move
+def _store_tt(h, depth, value, best_move, alpha_orig, beta_orig):
+    # Stores a search result with the right bound flag. Timed-out nodes
+    # raise SearchTimeout before reaching this, so only completed
+    # results are cached.
+    if value <= alpha_orig:
+        flag = UPPER
+    elif value >= beta_orig:
+        flag = LOWER
     else:
-        min_eval = math.inf
-        for move in valid_moves:
-            new_board = copy.deepcopy(board)
-            apply_move(new_board, move[0], move[1], opponent)
-            eval_score, _ = minimax(
-                new_board,
+        flag = EXACT
+    if len(_TT) >= _TT_MAX and h not in _TT:
+        # FIFO eviction: dicts iterate in insertion order, so the oldest
+        # entry is the first one.
+        del _TT[next(iter(_TT))]
+    _TT[h] = (depth, value, flag, best_move)
+
+
+def negamax(P, O, depth, alpha, beta, h, color, deadline, tt_move=None):
+    # Negamax alpha-beta: the score is always from the side to move's
+    # perspective, so a single code path serves both players. h is the
+    # Zobrist hash of (P, O) with color to move, maintained incrementally.
+    _node_count[0] += 1
+    if _node_count[0] & _TIME_CHECK_MASK == 0 and time.time() > deadline:
+        raise SearchTimeout
+
+    # Transposition-table probe: reuse a stored result if it was searched
+    # at least this deep, otherwise use its bound to tighten the window.
+    entry = _TT.get(h)
+    if entry is not None:
+        if entry[0] >= depth:
+            _, tt_value, tt_flag, stored_move = entry
+            if tt_flag == EXACT:
+                return tt_value, stored_move
+            if tt_flag == LOWER:
+                alpha = max(alpha, tt_value)
+            elif tt_flag == UPPER:
+                beta = min(beta, tt_value)
+            if beta <= alpha:
+                return tt_value, stored_move
+        if tt_move is None:
+            tt_move = entry[3]
+
+    moves_bb = get_moves_bb(P, O)
+
+    if not moves_bb:
+        if get_moves_bb(O, P) == 0:
+            # Neither side can move: game over, score the final position.
+            return _eval_fun(P, O, 0), None
+        # Pass: the opponent moves again from the same position.
+        value, _ = negamax(
+            O, P, depth, -beta, -alpha, h ^ ZOBRIST_SIDE, 1 - color, deadline,
+        )
+        return -value, None
+
+    if depth == 0:
+        return _eval_fun(P, O, moves_bb), None
+
+    valid_moves = get_moves_with_flips(P, O)
+
+    # Order moves: PV/TT move first, then killers, then by static square
+    # weight (corners early, X-squares last). Good ordering is what
+    # makes alpha-beta cut early.
+    killers = _killers.get(depth, ())
+
+    def order(entry):
+        move = entry[0]
+        if move == tt_move:
+            return -1000
+        if move in killers:
+            return -500
+        return -SQUARE_WEIGHTS[move[0] * 8 + move[1]]
+
+    valid_moves.sort(key=order)
+
+    alpha_orig = alpha
+    best_value = -math.inf
+    best_move = None
+    for move, bit, flip in valid_moves:
+        child_P, child_O = O & ~flip, P | flip | bit
+        child_moves = get_moves_bb(child_P, child_O) if depth == 1 else 0
+        if child_moves:
+            # Most nodes are depth-1 parents of leaves: evaluate the child
+            # directly instead of paying a recursive call that would
+            # return the evaluation anyway. Children where the opponent
+            # must pass still go through the recursion.
+            value = -_eval_fun(child_P, child_O, child_moves)
+        else:
+            value, _ = negamax(
+                child_P,
+                child_O,
                 depth - 1,
-                alpha,
-                beta,
-                True,
-                player,
-                start_time,
-                time_limit,
-                eval_fun,
+                -beta,
+                -alpha,
+                _update_hash(h, color, bit, flip),
+                1 - color,
+                deadline,
             )
-            if eval_score < min_eval:
-                min_eval = eval_score
-                best_move = move
-            beta = min(beta, eval_score)
-            if beta <= alpha or time.time() - start_time > time_limit:
-                break
-        return min_eval, best_move
+            value = -value
+        if value > best_value:
+            best_value = value
+            best_move = move
+        alpha = max(alpha, value)
+        if alpha >= beta:
+            _record_killer(depth, move)
+            break
+    _store_tt(h, depth, best_value, best_move, alpha_orig, beta)
+    return best_value, best_move
 
 
 def random_move(board, player):
@@ -180,20 +430,128 @@ def random_move(board, player):
     return random.choice(valid_moves) if valid_moves else None
 
 
-def computer_move(board, player, time_limit, eval_fun):
+def _search_root_child(args):
+    # Worker for the parallel root search: scores the child position one
+    # root move leads to. Runs in its own process, with its own TT.
+    child_P, child_O, depth, alpha, beta, color, deadline, eval_fun = args
+    global _eval_fun
+    _eval_fun = eval_fun
+    try:
+        value, _ = negamax(
+            child_P,
+            child_O,
+            depth,
+            -beta,
+            -alpha,
+            _hash_pos(child_P, child_O, color),
+            color,
+            deadline,
+        )
+    except SearchTimeout:
+        return None
+    # The child is scored from the opponent's perspective; negate it.
+    return -value
+
 
+def computer_move(board, player, time_limit, eval_fun):
+    # Iterative deepening with root splitting: at every depth the root
+    # moves lead to independent subtrees, so each one is searched in its
+    # own process (sidestepping the GIL) and the scores are combined
+    # here. The move from the deepest fully completed depth is kept.
+    global _eval_fun
+    _eval_fun = eval_fun
     start_time = time.time()
-    _, best_move = minimax(
-        board,
-        depth=10,
-        alpha=-math.inf,
-        beta=math.inf,
-        maximizing_player=True,
-        player=player,
-        start_time=start_time,
-        time_limit=time_limit,
-        eval_fun=eval_fun,
-    )
+    # One precomputed deadline is threaded through the search instead of
+    # re-deriving start_time + time_limit at every throttled check.
+    deadline = start_time + time_limit
+    _TT.clear()
+    _killers.clear()
+    _node_count[0] = 0
+    P, O = _player_boards(board, player)
+    opp_color = 1 - COLOR[player]
+    root_moves = get_moves_with_flips(P, O)
+    if not root_moves:
+        return None
+    if len(root_moves) == 1:
+        return root_moves[0][0]
+
+    children = []
+    for move, bit, flip in root_moves:
+        # The side to move in the child is the opponent.
+        children.append((move, (O & ~flip, P | flip | bit)))
+
+    def search_depth(executor, depth, alpha, beta):
+        # Young brothers wait: search the first child (the previous best
+        # move) serially in this process to establish a real lower
+        # bound, then farm the remaining moves out with the tightened
+        # window so the workers can cut off against it.
+        first_move, first_child = children[0]
+        value = _search_root_child(
+            (first_child[0], first_child[1], depth - 1, alpha, beta, opp_color, deadline, eval_fun)
+        )
+        if value is None:
+            return None, None, True
+        best_value, best = value, first_move
+        if value > alpha:
+            alpha = value
+        futures = [
+            (
+                move,
+                executor.submit(
+                    _search_root_child,
+                    (child[0], child[1], depth - 1, alpha, beta, opp_color, deadline, eval_fun),
+                ),
+            )
+            for move, child in children[1:]
+        ]
+        timed_out = False
+        for move, future in futures:
+            value = future.result()
+            if value is None:
+                timed_out = True
+            elif value > alpha and value > best_value:
+                # A sibling searched with the tightened window only
+                # proves an upper bound when it fails low, and that
+                # bound can equal the serial child's exact score; a
+                # sibling becomes the new best only when it strictly
+                # beats the bound it was searched against.
+                best_value, best = value, move
+        return best_value, best, timed_out
+
+    best_move = None
+    prev_value = None
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+        for depth in range(1, 65):
+            if depth > 1 and time.time() - start_time > time_limit * 0.5:
+                # Each depth costs roughly as much as all shallower ones
+                # combined; with half the budget gone the next one would
+                # almost surely be cut off and discarded, so stop here.
+                break
+            # Aspiration window: start with a narrow window around the
+            # previous depth's score and re-search wider on a fail.
+            if prev_value is None:
+                alpha, beta = -math.inf, math.inf
+            else:
+                alpha, beta = prev_value - ASPIRATION, prev_value + ASPIRATION
+            while True:
+                value, move, timed_out = search_depth(executor, depth, alpha, beta)
+                if timed_out or value is None:
+                    break
+                if alpha < value < beta or (alpha == -math.inf and beta == math.inf):
+                    break
+                # A score landing on an aspiration bound would ping-pong
+                # between the two half-open windows forever; one fully
+                # open re-search always produces an exact score.
+                alpha, beta = -math.inf, math.inf
+            if value is not None and (best_move is None or not timed_out):
+                prev_value, best_move = value, move
+                # Put the new best move first for the next depth's
+                # serial young-brother search.
+                children.sort(key=lambda mc: mc[0] != best_move)
+            if timed_out:
+                # This depth was cut off mid-search; its result only
+                # counts if we have nothing better.
+                break
     return best_move
 
 
@@ -236,6 +594,8 @@ def choose_evaluation_function():
 def play_game():
 
     board = initialize_board()
+    # Cached evaluations from an earlier game are stale noise; drop them.
+    _EVAL_CACHE.clear()
     print("Welcome to Othello!")
 
     # Let the user select player types
@@ -268,11 +628,11 @@ def play_game():
 
         if not valid_moves:
             print(f"No valid moves for {current_player}. Passing turn.")
-            current_player = player2 if current_player == player1 else player1
+            current_player = OPP[current_player]
             if not get_valid_moves(board, current_player):
                 print("No moves for either player. Game over!")
-                player1_score = sum(row.count(player1) for row in board)
-                player2_score = sum(row.count(player2) for row in board)
+                player1_score = board[0].bit_count()
+                player2_score = board[1].bit_count()
                 print(
                     f"Final score - {player1}: {player1_score}, {player2}: {player2_score}"
                 )
@@ -315,15 +675,17 @@ def play_game():
             print("Minimax AI is thinking...")
             move = computer_move(board, current_player, time_limit, eval_fn)
             print(f"Minimax AI chooses move: {move}")
-            print("Evaluation score:", eval_fn(board, current_player))
+            print(
+                "Evaluation score:", eval_fn(*_player_boards(board, current_player))
+            )
         elif player_type == "random":
             print("Random AI is making a move...")
             move = random_move(board, current_player)
             print(f"Random AI chooses move: {move}")
 
         if move:
-            apply_move(board, move[0], move[1], current_player)
-            current_player = player2 if current_player == player1 else player1
+            board = apply_move(board, move[0], move[1], current_player)
+            current_player = OPP[current_player]
 
 
 if __name__ == "__main__":